@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import io
 import itertools
 import json
@@ -7,14 +8,12 @@ import os
 import os.path
 import shlex
 import shutil
-import subprocess
 import tempfile
-from base64 import b64encode
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from importlib.metadata import version, PackageNotFoundError
-from typing import Any, Dict, List
+from typing import Any, Coroutine, Dict, List, Optional, Sequence, Tuple
 
-import cairosvg
 import dateparser
 import matplotlib.dates as mdates  # noqa
 import matplotlib.pyplot as plt  # noqa
@@ -22,17 +21,32 @@ import maya
 import pygal
 import pypandoc
 import semver
-from chaoslib import substitute
-from chaoslib.caching import cache_activities, lookup_activity
-from chaoslib.types import Configuration, Experiment, Journal, Run, Secrets
+from chaoslib.types import (
+    Activity,
+    Configuration,
+    Experiment,
+    Journal,
+    Run,
+    Secrets,
+)
 from jinja2 import Environment, PackageLoader
 from natural import date
 from pygal.style import DefaultStyle, LightColorizedStyle
 
+from chaosreport.assets import AssetTable, embed_assets, register_asset
+from chaosreport.chartdata import encode_chart, parse_timestamp
+from chaosreport.substitution import (
+    SubstitutionTable,
+    make_substitution,
+    preresolve_activities,
+)
+
 __all__ = [
     "__version__",
     "generate_report",
     "generate_report_header",
+    "generate_report_headers",
+    "generate_reports",
     "save_report",
 ]
 try:
@@ -47,18 +61,44 @@ basedir = os.path.dirname(__file__)
 css_dir = os.path.join(basedir, "template", "css")
 js_dir = os.path.join(basedir, "template", "js")
 
+# seconds given to each vegeta command to complete
+VEGETA_TIMEOUT = 10
+
 
 def generate_report_header(
     journal_paths: List[str],
     export_format: str = "markdown",
     title: str = None,
 ) -> str:
+    return generate_report_headers(journal_paths, [export_format], title)[
+        export_format
+    ]
+
+
+def generate_report_headers(
+    journal_paths: List[str],
+    export_formats: List[str],
+    title: str = None,
+    assets: AssetTable = None,
+) -> Dict[str, str]:
+    """
+    Generate the report header once for each of the given export formats.
+
+    The journals are parsed and the charts are built a single time, only the
+    final template rendering is done per format.
+
+    When an asset table is given, the charts are stored into it and only
+    referenced from the header, see `save_report`. Otherwise, they are
+    embedded into each header.
+    """
+    standalone = assets is None
+    if standalone:
+        assets = {}
     header_template = get_report_template(None, "header.md")
 
     header_info = {}
     header_info["title"] = title or "Chaos Engineering Report"
     header_info["today"] = datetime.now().strftime("%d %B %Y")
-    header_info["export_format"] = export_format
     tags = []
 
     contribution_labels = []
@@ -116,14 +156,9 @@ def generate_report_header(
             ],
         )
 
-        if export_format in ["html", "html5"]:
-            header_info["contribution_distribution"] = dist_chart.render(
-                disable_xml_declaration=True
-            )
-        else:
-            header_info["contribution_distribution"] = b64encode(
-                cairosvg.svg2png(bytestring=dist_chart.render(), dpi=72)
-            ).decode("utf-8")
+        header_info["contribution_distribution"] = register_asset(
+            assets, render_chart(dist_chart)
+        )
 
         contribution_labels = list(unique_contributions)
 
@@ -168,14 +203,9 @@ def generate_report_header(
                 allow_interruptions=True,
             )
 
-        if export_format in ["html", "html5"]:
-            header_info["contributions_per_exp"] = chart.render(
-                disable_xml_declaration=True
-            )
-        else:
-            header_info["contributions_per_exp"] = b64encode(
-                cairosvg.svg2png(bytestring=chart.render(), dpi=72)
-            ).decode("utf-8")
+        header_info["contributions_per_exp"] = register_asset(
+            assets, render_chart(chart)
+        )
 
         chart = pygal.Radar(
             legend_at_bottom_columns=1,
@@ -196,14 +226,9 @@ def generate_report_header(
                 allow_interruptions=True,
             )
 
-        if export_format in ["html", "html5"]:
-            header_info["contributions_per_exp_radar"] = chart.render(
-                disable_xml_declaration=True
-            )
-        else:
-            header_info["contributions_per_exp_radar"] = b64encode(
-                cairosvg.svg2png(bytestring=chart.render(), dpi=72)
-            ).decode("utf-8")
+        header_info["contributions_per_exp_radar"] = register_asset(
+            assets, render_chart(chart)
+        )
 
         #######################################################################
         # Dot chart per tag
@@ -240,17 +265,20 @@ def generate_report_header(
                 tag, contributions[tag], fill=False, allow_interruptions=True
             )
 
-        if export_format in ["html", "html5"]:
-            header_info["contributions_per_tag"] = chart.render(
-                disable_xml_declaration=True
-            )
-        else:
-            header_info["contributions_per_tag"] = b64encode(
-                cairosvg.svg2png(bytestring=chart.render(), dpi=72)
-            ).decode("utf-8")
+        header_info["contributions_per_tag"] = register_asset(
+            assets, render_chart(chart)
+        )
 
-    header = header_template.render(header_info)
-    return header
+    headers = {}
+    for export_format in export_formats:
+        header = header_template.render(
+            header_info, export_format=export_format
+        )
+        if standalone:
+            header = embed_assets(header, assets, export_format)
+        headers[export_format] = header
+
+    return headers
 
 
 def generate_report(
@@ -265,38 +293,158 @@ def generate_report(
     The report is first generated from the markdown template and converted to
     the desired format using Pandoc.
     """
+    return generate_reports(journal, [export_format], config, secrets)[
+        export_format
+    ]
+
+
+def generate_reports(
+    journal: Dict[str, Any],
+    export_formats: List[str],
+    config: Configuration = None,
+    secrets: Secrets = None,
+    assets: AssetTable = None,
+    interactive_charts: bool = False,
+    substitutions: SubstitutionTable = None,
+) -> Dict[str, str]:
+    """
+    Generate one report document per export format from a single journal.
+
+    The journal is pre-processed, its charts built and the template looked up
+    only once for all the formats. Charts are kept as SVG and rasterized to
+    PNG, once, only when a format that needs images is rendered.
+
+    When an asset table is given, the charts are stored into it and only
+    referenced from the reports so that all the reports of a single document
+    share each unique chart, see `save_report`. Otherwise, they are embedded
+    into each report.
+
+    With `interactive_charts`, HTML reports embed the Prometheus and vegeta
+    data in a compact columnar form that the browser draws, instead of SVG.
+
+    Configuration and secret substitutions are memoized into the given
+    substitution table, so that the journals of a single report share them.
+    """
+    standalone = assets is None
+    if standalone:
+        assets = {}
+
     # inject some pre-processed values into the journal for rendering
     experiment = journal["experiment"]
-    cache_activities(experiment)
+    activities = index_activities(experiment)
     journal["chaoslib_version"] = journal["chaoslib-version"]
     journal["hypo"] = experiment.get("steady-state-hypothesis")
-    journal["num_probes"] = count_activities(experiment, "probe")
-    journal["num_actions"] = count_activities(experiment, "action")
+    journal["num_probes"] = activities["num_probes"]
+    journal["num_actions"] = activities["num_actions"]
+    journal["method_activities"] = activities["method"]
+    journal["rollback_activities"] = activities["rollbacks"]
     journal["human_duration"] = str(timedelta(seconds=journal["duration"]))
-    journal["export_format"] = export_format
     journal["today"] = datetime.now().strftime("%d %B %Y")
 
-    generate_chart_from_metric_probes(journal, export_format)
-    add_contribution_model(journal, export_format)
+    chart_kinds = set()
+    for export_format in export_formats:
+        if interactive_charts and export_format in ["html", "html5"]:
+            chart_kinds.add("data")
+        else:
+            chart_kinds.add("svg")
+
+    generate_chart_from_metric_probes(journal, chart_kinds)
+    add_contribution_model(journal)
+
+    # charts are registered once, the templates only refer to their label
+    for run in journal["run"]:
+        run["chart_assets"] = [
+            register_asset(assets, chart) for chart in run.get("charts", [])
+        ]
+    if experiment.get("contributions_chart"):
+        experiment["contributions_chart_asset"] = register_asset(
+            assets, experiment["contributions_chart"]
+        )
+
     template = get_report_template(
-        journal["chaoslib-version"], configuration=config, secrets=secrets
+        journal["chaoslib-version"],
+        configuration=config,
+        secrets=secrets,
+        substitutions=substitutions,
     )
-    report = template.render(journal)
+    preresolve_activities(journal, template.globals["substitute"])
 
-    return report
+    reports = {}
+    for export_format in export_formats:
+        report = template.render(journal, export_format=export_format)
+        if standalone:
+            report = embed_assets(report, assets, export_format)
+        reports[export_format] = report
 
+    return reports
 
-def count_activities(experiment: Experiment, activity_type: str) -> int:
+
+def count_activities(
+    experiment: Experiment,
+    activity_type: str,
+    activities: Dict[str, Any] = None,
+) -> int:
     """
     Count the number of activity by type in the experiment's method
+
+    Pass the index built by `index_activities` to count from it, the
+    experiment is indexed again otherwise.
     """
-    count = 0
-    for activity in experiment["method"]:
-        if "ref" in activity:
-            activity = lookup_activity(activity["ref"])
-        if activity["type"] == activity_type:
-            count += 1
-    return count
+    if activities is None:
+        activities = index_activities(experiment)
+    return len(
+        [
+            activity
+            for activity in activities["method"]
+            if activity.get("type") == activity_type
+        ]
+    )
+
+
+def index_activities(experiment: Experiment) -> Dict[str, Any]:
+    """
+    Index the activities declared by an experiment in a single walk.
+
+    References are resolved against the activities of this experiment only,
+    as chaostoolkit does when running it, rather than through the process
+    wide cache of chaoslib, so journals can be rendered concurrently.
+
+    Steady state hypothesis probes may be referenced by the method. The index
+    holds the resolved method and rollbacks as well as the number of probes
+    and actions in the method.
+    """
+    hypothesis = experiment.get("steady-state-hypothesis") or {}
+
+    method = experiment.get("method", [])
+    probes = hypothesis.get("probes", [])
+
+    by_name = {}
+    for activity in method + probes:
+        name = activity.get("name")
+        if name:
+            by_name[name] = activity
+
+    def resolve(activity: Activity) -> Activity:
+        if "ref" not in activity:
+            return activity
+
+        resolved = by_name.get(activity["ref"])
+        if resolved is None:
+            logger.warning(
+                "Activity reference '{}' could not be resolved".format(
+                    activity["ref"]
+                )
+            )
+            return activity
+        return resolved
+
+    method = [resolve(a) for a in method]
+    return {
+        "method": method,
+        "rollbacks": [resolve(a) for a in experiment.get("rollbacks", [])],
+        "num_probes": len([a for a in method if a.get("type") == "probe"]),
+        "num_actions": len([a for a in method if a.get("type") == "action"]),
+    }
 
 
 def save_report(
@@ -304,13 +452,28 @@ def save_report(
     reports: List[str],
     report_path: str,
     export_format: str = "markdown",
+    assets: AssetTable = None,
+    optimize_images: bool = False,
 ):
-    with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8") as fp:
-        fp.write(header)
+    """
+    Assemble the header and reports into a single document and convert it to
+    the export format with Pandoc.
 
-        for report in reports:
-            fp.write(report)
+    The asset table the header and reports were generated with must be given
+    so their charts can be embedded, each unique chart being stored only once
+    in the document.
+    """
+    document = header + "".join(reports)
+    if assets is not None:
+        document = embed_assets(
+            document, assets, export_format, optimize_png=optimize_images
+        )
 
+    with (
+        tempfile.NamedTemporaryFile(mode="w", encoding="utf-8") as fp,
+        tempfile.NamedTemporaryFile(mode="w", encoding="utf-8") as js_fp,
+    ):
+        fp.write(document)
         fp.seek(0)
 
         extra_args = []
@@ -336,6 +499,20 @@ def save_report(
                 os.path.join(css_dir, "main.css"),
             ]
         )
+        if export_format == "markdown":
+            # keep images as references so shared charts are written once
+            extra_args.append("--reference-links")
+
+        if (
+            export_format in ["html", "html5"]
+            and 'class="chaosreport-chart"' in document
+        ):
+            # interactive charts are drawn by a script added once per report
+            with io.open(os.path.join(js_dir, "charts.js")) as f:
+                js_fp.write("<script>\n{}\n</script>\n".format(f.read()))
+            js_fp.seek(0)
+            extra_args.extend(["--include-after-body", js_fp.name])
+
         pypandoc.convert_file(
             fp.name,
             to=export_format,
@@ -350,10 +527,14 @@ def get_report_template(
     default_template: str = "index.md",
     configuration: Configuration = None,
     secrets: Secrets = None,
+    substitutions: SubstitutionTable = None,
 ):
     """
     Retrieve and return the most appropriate template based on the
     chaostoolkit-lib version used when running the experiment.
+
+    Values resolved by `substitute` are memoized into the given substitution
+    table.
     """
     env = Environment(loader=PackageLoader("chaosreport", "template"))
     env.filters["pretty_date"] = lambda d: str(
@@ -363,29 +544,16 @@ def get_report_template(
         dateparser.parse(d0), dateparser.parse(d1), words=False
     )[0]
 
-    def substitution(args, is_tolerance: bool = False) -> Any:
-        if is_tolerance:
-            if isinstance(args, dict):
-                if args.get("type") == "probe":
-                    args = args.get("provider", {}).get("arguments")
-                    args.pop("value", None)
-
-        if isinstance(args, dict):
-            return {
-                k: substitute(v, configuration, secrets)
-                for k, v in args.items()
-            }
-
-        return substitute(args, configuration, secrets)
-
-    env.globals["substitute"] = substitution
+    env.globals["substitute"] = make_substitution(
+        configuration, secrets, substitutions
+    )
 
     if not report_version:
         return env.get_template(default_template)
 
     templates = []
     for name in env.list_templates(["md"]):
-        if name in ["index.md", "header.md"]:
+        if name in ["index.md", "header.md", "summary.md"]:
             continue
 
         _, _, v = name.split("_")
@@ -412,11 +580,43 @@ def get_report_template(
     return env.get_template(default_template)
 
 
-def generate_chart_from_metric_probes(journal: Journal, export_format: str):
+def render_chart(chart: pygal.Graph) -> str:
     """
-    Generate charts from probes that pulled data. The charts
-    are serialized to SVG (for HTML reports) or PNG (for PDF reports).
+    Serialize a chart to an SVG document that can be inlined in HTML reports
+    or rasterized for the other formats.
     """
+    return chart.render(disable_xml_declaration=True)
+
+
+def generate_chart_from_metric_probes(
+    journal: Journal, chart_kinds: Sequence[str] = ("svg",)
+):
+    """
+    Generate charts from probes that pulled data. The charts are serialized
+    to SVG, rasterized later on for formats that cannot inline them, and/or
+    to compact data drawn by the browser in interactive HTML reports,
+    depending on the requested `chart_kinds`: `"svg"` and `"data"`.
+
+    Runs are processed concurrently, see `extract_charts`.
+    """
+    run_coroutine(extract_charts(journal, chart_kinds))
+
+
+async def extract_charts(
+    journal: Journal,
+    chart_kinds: Sequence[str] = ("svg",),
+    executor: Executor = None,
+):
+    """
+    Generate the charts of all the runs of the journal concurrently.
+
+    External tools are awaited on the event loop so their I/O overlaps while
+    CPU bound chart building is handed off to the `executor`, the loop's
+    default one when not set. Each run only ever receives its own charts, in
+    a fixed order, so the result does not depend on completion order.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = []
     for run in journal["run"]:
         if run["status"] != "succeeded":
             continue
@@ -429,18 +629,50 @@ def generate_chart_from_metric_probes(journal: Journal, export_format: str):
                 "chaosprometheus" in provider["module"]
                 and activity_type == "probe"
             ):
-                generate_chart_from_prometheus(run, export_format)
+                tasks.append(
+                    loop.run_in_executor(
+                        executor,
+                        generate_chart_from_prometheus,
+                        run,
+                        chart_kinds,
+                    )
+                )
 
         elif provider["type"] == "process":
             path = provider["path"]
             if "vegeta" in path:
-                generate_from_vegeta_result(run, export_format)
+                tasks.append(
+                    generate_from_vegeta_result_async(
+                        run, chart_kinds, executor
+                    )
+                )
+
+    await asyncio.gather(*tasks)
 
 
-def generate_chart_from_prometheus(run: Run, export_format: str):
+def run_coroutine(coro: Coroutine) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    When an event loop is already running in this thread, for instance when
+    reports are generated from asynchronous code, the coroutine is run in
+    its own loop from another thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def generate_chart_from_prometheus(
+    run: Run, chart_kinds: Sequence[str] = ("svg",)
+):
     """
     Generate charts from probes that pulled data out of Prometheus. The charts
-    are serialized to SVG (for HTML reports) and PNG (for PDF reports).
+    are serialized to SVG and/or compact data for interactive HTML reports.
     """
     output = run.get("output")
     if not isinstance(output, dict):
@@ -450,15 +682,6 @@ def generate_chart_from_prometheus(run: Run, export_format: str):
     if data:
         result_type = data.get("resultType")
         if result_type == "matrix":
-            chart = pygal.Line(
-                x_label_rotation=20,
-                style=DefaultStyle,
-                truncate_legend=-1,
-                show_minor_x_labels=False,
-                legend_at_bottom=True,
-                legend_at_bottom_columns=1,
-            )
-
             # we may have series with different x length, so we try to
             # generate a set of all seen abscisses
             x = set([])
@@ -467,18 +690,13 @@ def generate_chart_from_prometheus(run: Run, export_format: str):
                 for value in values:
                     x.add(value[0])
 
-            # now we have our range of abscissa, let's map those
-            # timestamps to formatted strings
             x = sorted(list(x))
-            fromts = datetime.utcfromtimestamp
-            chart.x_labels = [
-                fromts(v).strftime("%Y-%m-%d\n %H:%M:%S") for v in x
-            ]
-            chart.x_labels_major = chart.x_labels[::10]
-            chart.title = "Query -  {}".format(
+            x_index = {v: idx for idx, v in enumerate(x)}
+            title = "Query -  {}".format(
                 run["activity"]["provider"]["arguments"]["query"]
             )
 
+            series = []
             for result in data["result"]:
                 # initialize first to null values to handle missing data
                 y = [None] * len(x)
@@ -486,8 +704,7 @@ def generate_chart_from_prometheus(run: Run, export_format: str):
                 # next, we update the y with actual values
                 values = result.get("values")
                 for value in values:
-                    x_idx = x.index(value[0])
-                    y[x_idx] = int(value[1])
+                    y[x_index[value[0]]] = value[1]
 
                 metric = result["metric"]
                 if "method" in metric:
@@ -502,22 +719,63 @@ def generate_chart_from_prometheus(run: Run, export_format: str):
                     y_label = "_".join(
                         [v for k, v in metric.items() if k != "__name__"]
                     )
-                chart.add(y_label, y, allow_interruptions=True)
+                series.append((y_label, y))
 
-            if export_format in ["html", "html5"]:
-                run["charts"] = [chart.render(disable_xml_declaration=True)]
-            else:
-                run["charts"] = [
-                    b64encode(
-                        cairosvg.svg2png(bytestring=chart.render(), dpi=72)
-                    ).decode("utf-8")
+            if "data" in chart_kinds:
+                columns = [
+                    (y_label, [None if v is None else float(v) for v in y])
+                    for y_label, y in series
                 ]
+                run["chart_data"] = [encode_chart(title, x, columns)]
 
+            if "svg" not in chart_kinds:
+                return
 
-def generate_from_vegeta_result(run: Run, export_format: str):
+            chart = pygal.Line(
+                x_label_rotation=20,
+                style=DefaultStyle,
+                truncate_legend=-1,
+                show_minor_x_labels=False,
+                legend_at_bottom=True,
+                legend_at_bottom_columns=1,
+            )
+
+            # now we have our range of abscissa, let's map those
+            # timestamps to formatted strings
+            fromts = datetime.utcfromtimestamp
+            chart.x_labels = [
+                fromts(v).strftime("%Y-%m-%d\n %H:%M:%S") for v in x
+            ]
+            chart.x_labels_major = chart.x_labels[::10]
+            chart.title = title
+
+            for y_label, y in series:
+                y = [None if v is None else int(v) for v in y]
+                chart.add(y_label, y, allow_interruptions=True)
+
+            run["charts"] = [render_chart(chart)]
+
+
+def generate_from_vegeta_result(
+    run: Run, chart_kinds: Sequence[str] = ("svg",)
+):
     """
     Generate charts from probes that pulled data out of Prometheus. The charts
-    are serialized to SVG (for HTML reports) and PNG (for PDF reports).
+    are serialized to SVG and/or compact data for interactive HTML reports.
+    """
+    run_coroutine(generate_from_vegeta_result_async(run, chart_kinds))
+
+
+async def generate_from_vegeta_result_async(
+    run: Run,
+    chart_kinds: Sequence[str] = ("svg",),
+    executor: Executor = None,
+):
+    """
+    Asynchronous version of `generate_from_vegeta_result`.
+
+    Both vegeta invocations run concurrently, with a timeout, and the charts
+    are built in the `executor`.
     """
     vegeta_path = shutil.which("vegeta")
     if not vegeta_path:
@@ -556,133 +814,216 @@ def generate_from_vegeta_result(run: Run, export_format: str):
         )
         return
 
-    cmd = "{} report --type text {}".format(vegeta_path, result_path)
+    text, calls = await asyncio.gather(
+        run_vegeta(
+            vegeta_path, ["report", "--type", "text", result_path], "reporter"
+        ),
+        run_vegeta(
+            vegeta_path, ["encode", "--to", "json", result_path], "dumper"
+        ),
+    )
+    if text is not None:
+        run["text"] = text
+
+    if calls is None:
+        return
+
+    loop = asyncio.get_running_loop()
+    charts, chart_data = await loop.run_in_executor(
+        executor, build_vegeta_charts, calls, chart_kinds
+    )
+    if chart_data:
+        run["chart_data"] = chart_data
+    if charts:
+        run.setdefault("charts", []).extend(charts)
+
+
+async def run_vegeta(
+    vegeta_path: str, args: List[str], name: str
+) -> Optional[str]:
+    """
+    Run a vegeta command and return its output, or `None` when it failed or
+    took longer than `VEGETA_TIMEOUT` seconds to complete.
+    """
     try:
-        proc = subprocess.run(
-            cmd,
-            timeout=10,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=True,
-            check=True,
+        proc = await asyncio.create_subprocess_exec(
+            vegeta_path,
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-    except subprocess.CalledProcessError as x:
-        logger.error("vegeta reporter failed: {}".format(str(x)))
-    except subprocess.TimeoutExpired:
-        logger.error("vegeta reporter took too long to complete")
-    else:
-        run["text"] = proc.stdout.decode("utf-8")
-
-    cmd = "{} encode --to json {}".format(vegeta_path, result_path)
+    except OSError as x:
+        logger.error("vegeta {} failed: {}".format(name, str(x)))
+        return None
+
     try:
-        proc = subprocess.run(
-            cmd,
-            timeout=10,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=True,
-            check=True,
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate(), VEGETA_TIMEOUT
         )
-    except subprocess.CalledProcessError as x:
-        logger.error("vegeta reporter failed: {}".format(str(x)))
-    except subprocess.TimeoutExpired:
-        logger.error("vegeta dumper took too long to complete")
-    else:
-        calls = proc.stdout.decode("utf-8").strip().replace("\n", ",")
-        data = json.loads("[{}]".format(calls))
-
-        def latency_chart() -> pygal.Line:
-            chart = pygal.Line(
-                x_label_rotation=20,
-                style=DefaultStyle,
-                logarithmic=True,
-                show_minor_x_labels=False,
-                legend_at_bottom=False,
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        logger.error("vegeta {} took too long to complete".format(name))
+        return None
+
+    if proc.returncode != 0:
+        logger.error(
+            "vegeta {} failed: {}".format(
+                name, stderr.decode("utf-8", errors="replace").strip()
             )
-            chart.title = "HTTP Latency"
-            chart.y_title = "Latency (in ms)"
-            chart.x_labels = [call["timestamp"] for call in data]
-            num_entries = len(chart.x_labels)
-            step = 10
-            if num_entries > 100:
-                step = 200
-            elif num_entries > 1000:
-                step = 2000
-            chart.x_labels_major = chart.x_labels[::step]
-
-            y_values = {}
-            for index, call in enumerate(data):
-                code = str(call["code"])
-                if code not in y_values:
-                    y_values[code] = [None] * num_entries
-
-                latency = call["latency"] / 1000000.0
-                y_values[code].insert(index, latency)
+        )
+        return None
 
-            for code, latencies in y_values.items():
-                chart.add(code, latencies, allow_interruptions=True)
+    return stdout.decode("utf-8")
 
-            return chart
 
-        def status_distribution() -> pygal.Bar:
-            chart = pygal.Bar(
-                x_label_rotation=20,
-                style=DefaultStyle,
-                show_minor_x_labels=False,
-                legend_at_bottom=False,
+def build_vegeta_charts(
+    calls: str, chart_kinds: Sequence[str] = ("svg",)
+) -> Tuple[List[str], List[str]]:
+    """
+    Build the latency and status distribution charts from the JSON encoded
+    vegeta results. Returns the SVG charts and the interactive chart data,
+    each empty unless requested in `chart_kinds`.
+    """
+    calls = calls.strip().replace("\n", ",")
+    data = json.loads("[{}]".format(calls))
+
+    def latency_chart() -> pygal.Line:
+        chart = pygal.Line(
+            x_label_rotation=20,
+            style=DefaultStyle,
+            logarithmic=True,
+            show_minor_x_labels=False,
+            legend_at_bottom=False,
+        )
+        chart.title = "HTTP Latency"
+        chart.y_title = "Latency (in ms)"
+        chart.x_labels = [call["timestamp"] for call in data]
+        num_entries = len(chart.x_labels)
+        step = 10
+        if num_entries > 100:
+            step = 200
+        elif num_entries > 1000:
+            step = 2000
+        chart.x_labels_major = chart.x_labels[::step]
+
+        y_values = {}
+        for index, call in enumerate(data):
+            code = str(call["code"])
+            if code not in y_values:
+                y_values[code] = [None] * num_entries
+
+            latency = call["latency"] / 1000000.0
+            y_values[code].insert(index, latency)
+
+        for code, latencies in y_values.items():
+            chart.add(code, latencies, allow_interruptions=True)
+
+        return chart
+
+    def status_distribution() -> pygal.Bar:
+        chart = pygal.Bar(
+            x_label_rotation=20,
+            style=DefaultStyle,
+            show_minor_x_labels=False,
+            legend_at_bottom=False,
+        )
+        chart.title = "Distribution of HTTP Responses Per Second"
+        chart.y_title = "Status Code Count"
+
+        status_intervals = {}
+        for call in data:
+            ts = call["timestamp"]
+            dt = dateparser.parse(ts)
+            by_second_dt = dt.replace(microsecond=0).isoformat()
+            if by_second_dt not in status_intervals:
+                status_intervals[by_second_dt] = {}
+
+            code = call["code"]
+            if code not in status_intervals[by_second_dt]:
+                status_intervals[by_second_dt][code] = 0
+            status_intervals[by_second_dt][code] = (
+                status_intervals[by_second_dt][code] + 1
             )
-            chart.title = "Distribution of HTTP Responses Per Second"
-            chart.y_title = "Status Code Count"
-
-            status_intervals = {}
-            for call in data:
-                ts = call["timestamp"]
-                dt = dateparser.parse(ts)
-                by_second_dt = dt.replace(microsecond=0).isoformat()
-                if by_second_dt not in status_intervals:
-                    status_intervals[by_second_dt] = {}
-
-                code = call["code"]
-                if code not in status_intervals[by_second_dt]:
-                    status_intervals[by_second_dt][code] = 0
-                status_intervals[by_second_dt][code] = (
-                    status_intervals[by_second_dt][code] + 1
-                )
 
-            chart.x_labels = list(status_intervals.keys())
-            chart.x_labels_major = chart.x_labels[::5]
+        chart.x_labels = list(status_intervals.keys())
+        chart.x_labels_major = chart.x_labels[::5]
 
-            num_entries = len(chart.x_labels)
-            y_values = {}
-            for index, interval in enumerate(status_intervals):
-                for code, count in status_intervals[interval].items():
-                    if code not in y_values:
-                        y_values[code] = [None] * num_entries
-                    y_values[code].insert(index, count)
+        num_entries = len(chart.x_labels)
+        y_values = {}
+        for index, interval in enumerate(status_intervals):
+            for code, count in status_intervals[interval].items():
+                if code not in y_values:
+                    y_values[code] = [None] * num_entries
+                y_values[code].insert(index, count)
 
-            for code, count in y_values.items():
-                chart.add(str(code), count, allow_interruptions=True)
+        for code, count in y_values.items():
+            chart.add(str(code), count, allow_interruptions=True)
 
-            return chart
+        return chart
 
-        def add_chart(chart: pygal.Graph):
-            if "charts" not in run:
-                run["charts"] = []
+    def latency_data() -> str:
+        # vegeta writes results in completion order while the browser
+        # expects increasing abscissa
+        calls = sorted(
+            ((parse_timestamp(call["timestamp"]), call) for call in data),
+            key=lambda pair: pair[0],
+        )
+        x = [ts for ts, _ in calls]
+        y_values = {}
+        for index, (_, call) in enumerate(calls):
+            code = str(call["code"])
+            if code not in y_values:
+                y_values[code] = [None] * len(calls)
+            y_values[code][index] = call["latency"] / 1000000.0
+
+        return encode_chart(
+            "HTTP Latency",
+            x,
+            list(y_values.items()),
+            y_title="Latency (in ms)",
+            logarithmic=True,
+        )
 
-            if export_format in ["html", "html5"]:
-                run["charts"].append(chart.render(disable_xml_declaration=True))  # noqa
-            else:
-                run["charts"].append(
-                    b64encode(
-                        cairosvg.svg2png(bytestring=chart.render(), dpi=72)
-                    ).decode("utf-8")
-                )
+    def status_distribution_data() -> str:
+        status_intervals = {}
+        for call in data:
+            by_second = int(parse_timestamp(call["timestamp"]))
+            codes = status_intervals.setdefault(by_second, {})
+            code = str(call["code"])
+            codes[code] = codes.get(code, 0) + 1
+
+        x = sorted(status_intervals)
+        y_values = {}
+        for index, interval in enumerate(x):
+            for code, count in status_intervals[interval].items():
+                if code not in y_values:
+                    y_values[code] = [0] * len(x)
+                y_values[code][index] = count
+
+        return encode_chart(
+            "Distribution of HTTP Responses Per Second",
+            x,
+            list(y_values.items()),
+            kind="bar",
+            y_title="Status Code Count",
+        )
+
+    charts = []
+    if "svg" in chart_kinds:
+        charts = [
+            render_chart(latency_chart()),
+            render_chart(status_distribution()),
+        ]
 
-        add_chart(latency_chart())
-        add_chart(status_distribution())
+    chart_data = []
+    if "data" in chart_kinds:
+        chart_data = [latency_data(), status_distribution_data()]
 
+    return charts, chart_data
 
-def add_contribution_model(journal: Journal, export_format: str):
+
+def add_contribution_model(journal: Journal):
     """
     Expose the contribution of that experiment to the report.
     """
@@ -704,11 +1045,4 @@ def add_contribution_model(journal: Journal, export_format: str):
 
         chart.add(contribution, value)
 
-    if export_format in ["html", "html5"]:
-        experiment["contributions_chart"] = chart.render(
-            disable_xml_declaration=True
-        )
-    else:
-        experiment["contributions_chart"] = b64encode(
-            cairosvg.svg2png(bytestring=chart.render(), dpi=72)
-        ).decode("utf-8")
+    experiment["contributions_chart"] = render_chart(chart)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import io
+import logging
+import re
+from base64 import b64encode
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import repeat
+from typing import Dict, List
+
+import cairosvg
+
+__all__ = [
+    "embed_assets",
+    "minify_svg",
+    "rasterize",
+    "register_asset",
+    "svg_to_png",
+]
+
+logger = logging.getLogger("chaostoolkit")
+
+AssetTable = Dict[str, Dict[str, str]]
+
+ASSET_LABEL = re.compile(r"chaosreport-asset-[0-9a-f]{16}")
+CHART_ID = re.compile(r'id="chart-([0-9a-f-]+)"')
+CHART_ID_PLACEHOLDER = "chaosreport-chart-id"
+VIEWBOX = re.compile(r'viewBox="([^"]*)"')
+XML_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+GEOMETRY_ATTRIBUTE = re.compile(
+    r'\b(d|x|y|cx|cy|r|width|height|transform|points)="([^"]*)"'
+)
+DECIMAL = re.compile(r"-?\d+\.\d+")
+
+
+def minify_svg(svg: str) -> str:
+    """
+    Shrink a pygal SVG chart without changing how it is drawn.
+
+    Comments are dropped and geometry coordinates rounded to two decimals,
+    which is far below what can be seen at the rendered resolution. Texts,
+    labels and tooltips values are left untouched.
+    """
+
+    def round_decimal(m: re.Match) -> str:
+        value = "{:.2f}".format(float(m.group(0))).rstrip("0").rstrip(".")
+        return "0" if value == "-0" else value
+
+    def round_attribute(m: re.Match) -> str:
+        return '{}="{}"'.format(
+            m.group(1), DECIMAL.sub(round_decimal, m.group(2))
+        )
+
+    svg = XML_COMMENT.sub("", svg)
+    svg = GEOMETRY_ATTRIBUTE.sub(round_attribute, svg)
+    return svg.replace(" />", "/>")
+
+
+def register_asset(assets: AssetTable, svg: str) -> str:
+    """
+    Store a SVG chart into the asset table of a report document and return
+    the label used to reference it from the markdown.
+
+    pygal gives every rendered chart a random identifier, it is swapped for
+    one derived from the chart content so that identical charts, rendered
+    from different journals or in the header, are stored only once.
+    """
+    svg = minify_svg(svg)
+
+    m = CHART_ID.search(svg)
+    if m:
+        svg = svg.replace(m.group(1), CHART_ID_PLACEHOLDER)
+
+    digest = hashlib.sha256(svg.encode("utf-8")).hexdigest()[:16]
+    label = "chaosreport-asset-{}".format(digest)
+    if label not in assets:
+        m = VIEWBOX.search(svg)
+        assets[label] = {
+            "svg": svg.replace(CHART_ID_PLACEHOLDER, digest),
+            "id": "chart-{}".format(digest),
+            "viewbox": m.group(1) if m else "0 0 800 600",
+        }
+
+    return label
+
+
+def embed_assets(
+    document: str,
+    assets: AssetTable,
+    export_format: str,
+    optimize_png: bool = False,
+    executor: Executor = None,
+) -> str:
+    """
+    Resolve the asset labels of a rendered report document.
+
+    In HTML documents, the first occurrence of a chart is inlined and the
+    following ones reuse it through a SVG `<use>` element. Other formats
+    refer to markdown image references whose definitions, one per unique
+    chart, are appended to the document. PNG images are rasterized once per
+    asset and kept in the table for the next format needing them.
+
+    The charts missing a PNG image are rasterized concurrently through the
+    `executor`, or a thread pool of its own when none is given.
+    """
+    if export_format in ["html", "html5"]:
+        inlined = set()
+
+        def inline(m: re.Match) -> str:
+            label = m.group(0)
+            asset = assets[label]
+            if label in inlined:
+                return '<svg viewBox="{}"><use href="#{}"/></svg>'.format(
+                    asset["viewbox"], asset["id"]
+                )
+            inlined.add(label)
+            return asset["svg"]
+
+        return ASSET_LABEL.sub(inline, document)
+
+    key = "optimized_png" if optimize_png else "png"
+    labels = list(dict.fromkeys(ASSET_LABEL.findall(document)))
+    missing = [label for label in labels if key not in assets[label]]
+    if missing:
+        svgs = [assets[label]["svg"] for label in missing]
+        if executor is None:
+            with ThreadPoolExecutor() as executor:
+                pngs = rasterize(executor, svgs, optimize_png)
+        else:
+            pngs = rasterize(executor, svgs, optimize_png)
+        for label, png in zip(missing, pngs):
+            assets[label][key] = png
+
+    definitions = [
+        "[{}]: data:image/png;base64,{}".format(label, assets[label][key])
+        for label in labels
+    ]
+
+    if not definitions:
+        return document
+
+    return "{}\n\n{}\n".format(document.rstrip("\n"), "\n".join(definitions))
+
+
+def rasterize(
+    executor: Executor, svgs: List[str], optimize: bool = False
+) -> List[str]:
+    """
+    Rasterize SVG charts to base64 encoded PNG images in the executor.
+    """
+    return list(executor.map(svg_to_png, svgs, repeat(optimize)))
+
+
+def svg_to_png(svg: str, optimize: bool = False) -> str:
+    """
+    Rasterize a SVG chart to a base64 encoded PNG image.
+
+    When `optimize` is set, the image is reduced to a palette, charts only
+    use a handful of colors, and re-encoded with the strongest compression.
+    This relies on Pillow and is skipped when it cannot be imported.
+    """
+    png = cairosvg.svg2png(bytestring=svg.encode("utf-8"), dpi=72)
+
+    if optimize:
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.warning("Pillow is required to optimize the report images")
+        else:
+            with Image.open(io.BytesIO(png)) as img:
+                img = img.convert("RGBA").quantize(
+                    colors=256, method=Image.Quantize.FASTOCTREE
+                )
+                buffer = io.BytesIO()
+                img.save(buffer, format="PNG", optimize=True)
+                png = buffer.getvalue()
+
+    return b64encode(png).decode("utf-8")
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import json
+import math
+import re
+import sys
+from array import array
+from base64 import b64encode
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+import dateparser
+
+__all__ = ["encode_chart", "parse_timestamp"]
+
+FRACTIONAL_SECONDS = re.compile(r"(\.\d{6})\d+")
+
+
+def encode_chart(
+    title: str,
+    timestamps: Sequence[float],
+    series: Sequence[Tuple[str, Sequence[Optional[float]]]],
+    kind: str = "line",
+    y_title: str = None,
+    logarithmic: bool = False,
+) -> str:
+    """
+    Serialize a time series chart to the compact JSON payload drawn by the
+    browser in interactive HTML reports (see `template/js/charts.js`).
+
+    Timestamps, in seconds, are delta-encoded as milliseconds in a 32-bit
+    integer array while each `(label, values)` serie is a 64-bit float
+    array where missing values are `NaN`. Both arrays are little-endian and
+    base64 encoded so the payload size is proportional to the number of
+    points.
+    """
+    ms = [int(round(t * 1000)) for t in timestamps]
+    deltas = [b - a for a, b in zip(ms, ms[1:])]
+
+    chart = {
+        "title": title,
+        "kind": kind,
+        "yTitle": y_title,
+        "logarithmic": logarithmic,
+        "x": {"start": ms[0] if ms else 0, "deltas": pack("i", deltas)},
+        "series": [
+            {
+                "label": label,
+                "values": pack(
+                    "d", [math.nan if v is None else v for v in values]
+                ),
+            }
+            for label, values in series
+        ],
+    }
+    return json.dumps(chart, separators=(",", ":"))
+
+
+def pack(typecode: str, values: Sequence[float]) -> str:
+    """
+    Pack numbers into a base64 encoded little-endian typed array.
+    """
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return b64encode(packed.tobytes()).decode("ascii")
+
+
+def parse_timestamp(ts: str) -> float:
+    """
+    Parse an ISO 8601 timestamp, such as the nanosecond precise ones written
+    by vegeta, into seconds since the epoch.
+
+    This is much faster than `dateparser` which is only used as a fallback.
+    """
+    try:
+        dt = datetime.fromisoformat(FRACTIONAL_SECONDS.sub(r"\1", ts))
+    except ValueError:
+        dt = dateparser.parse(ts)
+    return dt.timestamp()
@@ -10,10 +10,18 @@ from chaoslib import convert_vars, merge_vars
 from chaoslib.configuration import load_configuration
 from chaoslib.secret import load_secrets
 
-from chaosreport import generate_report, generate_report_header, save_report
+from chaosreport import generate_report_headers, generate_reports, save_report
+from chaosreport.summary import generate_summary_headers, summarize_journals
 
 __all__ = ["report"]
 
+FORMAT_EXTENSIONS = {
+    "html": ".html",
+    "html5": ".html",
+    "markdown": ".md",
+    "pdf": ".pdf",
+}
+
 
 def validate_vars(
     ctx: click.Context, param: click.Option, value: List[str]
@@ -28,6 +36,42 @@ def validate_vars(
         raise click.BadParameter(str(x))
 
 
+def validate_export_formats(
+    ctx: click.Context, param: click.Option, value: str
+) -> List[str]:
+    """
+    Process the comma separated `--export-format` value and return the list
+    of distinct formats, in the order they were given.
+    """
+    export_formats = []
+    for export_format in value.split(","):
+        export_format = export_format.strip()
+        if export_format and export_format not in export_formats:
+            export_formats.append(export_format)
+
+    if not export_formats:
+        raise click.BadParameter("at least one export format is required")
+
+    return export_formats
+
+
+def report_path_for_format(
+    report_path: str, export_format: str, export_formats: List[str]
+) -> str:
+    """
+    Return where the report for the given format should be saved.
+
+    When a single format is requested, the report path is used as-is.
+    Otherwise, its extension is swapped for the one matching each format.
+    """
+    if len(export_formats) == 1:
+        return report_path
+
+    root, _ = os.path.splitext(report_path)
+    ext = FORMAT_EXTENSIONS.get(export_format, ".{}".format(export_format))
+    return "{}{}".format(root, ext)
+
+
 @click.command()
 @click.option(
     "--title",
@@ -36,7 +80,39 @@ def validate_vars(
 @click.option(
     "--export-format",
     default="markdown",
-    help="Format to export the report to: html, markdown, pdf.",
+    callback=validate_export_formats,
+    help="Format to export the report to: html, markdown, pdf. Several "
+    "formats can be generated at once by separating them with a comma, "
+    "the report extension is then set to match each format.",
+)
+@click.option(
+    "--optimize-images",
+    is_flag=True,
+    help="Reduce the charts embedded as PNG images, in PDF and markdown "
+    "reports, to a palette and compress them more strongly.",
+)
+@click.option(
+    "--interactive-charts",
+    is_flag=True,
+    help="Draw the Prometheus and vegeta charts of HTML reports in the "
+    "browser, from compact data, rather than as SVG. Recommended for long "
+    "runs.",
+)
+@click.option(
+    "--summary",
+    is_flag=True,
+    help="Generate a compact summary of many journals: outcome counts, "
+    "duration percentiles per experiment, slowest activities and most "
+    "frequently failing probes, followed by the detailed report of the "
+    "most relevant runs only.",
+)
+@click.option(
+    "--summary-top",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Number of entries in each ranking of the summary, and of runs "
+    "given a detailed report.",
 )
 @click.option(
     "--var",
@@ -68,13 +144,40 @@ def report(
     journal: str = "journal.json",
     report: str = "report.md",
     title: str = None,
+    optimize_images: bool = False,
+    interactive_charts: bool = False,
+    summary: bool = False,
+    summary_top: int = 10,
 ):
     """
     Generate a report from the run journal(s).
     """
-    header = generate_report_header(journal, export_format, title)
-    report_path = report
-    reports = []
+    export_formats = export_format
+    report_paths = {
+        f: report_path_for_format(report, f, export_formats)
+        for f in export_formats
+    }
+    if len(set(report_paths.values())) != len(report_paths):
+        raise click.BadParameter(
+            "export formats must map to distinct report files",
+            param_hint="--export-format",
+        )
+
+    # charts are stored once in this table, whichever the number of
+    # journals and formats using them
+    assets = {}
+    # substituted activity values are shared by the journals of this report
+    substitutions = {}
+    if summary:
+        stats = summarize_journals(journal, top=summary_top)
+        headers = generate_summary_headers(stats, export_formats, title)
+        # only the most relevant runs are given a detailed report
+        journal = stats["details"]
+    else:
+        headers = generate_report_headers(
+            journal, export_formats, title, assets
+        )
+    reports = {f: [] for f in export_formats}
 
     if len(journal) == 1 and not os.path.isfile(journal[0]):
         journal = glob(journal)
@@ -90,7 +193,20 @@ def report(
         )
         secrets = load_secrets(experiment.get("secrets", {}), secret_vars)
 
-        reports.append(generate_report(j, export_format, config, secrets))
+        generated = generate_reports(
+            j,
+            export_formats,
+            config,
+            secrets,
+            assets,
+            interactive_charts,
+            substitutions,
+        )
+        for f, r in generated.items():
+            reports[f].append(r)
 
-    save_report(header, reports, report_path, export_format)
-    click.echo("Report generated as '{f}'".format(f=report))
+    for f in export_formats:
+        save_report(
+            headers[f], reports[f], report_paths[f], f, assets, optimize_images
+        )
+        click.echo("Report generated as '{f}'".format(f=report_paths[f]))
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import copy
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from chaoslib import substitute
+from chaoslib.types import Configuration, Journal, Secrets
+
+__all__ = ["make_substitution", "preresolve_activities"]
+
+Substitution = Callable[[Any, bool], Any]
+SubstitutionTable = Dict[Tuple[str, str, bool], Any]
+
+
+def make_substitution(
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    substitutions: SubstitutionTable = None,
+) -> Substitution:
+    """
+    Build the function the templates call to substitute configuration and
+    secret values into activity tolerances, pauses and arguments.
+
+    Values are memoized by identity, so the several references a template
+    makes to the same activity value are resolved once. When a substitution
+    table is given, misses fall back to it: it is keyed by the value content
+    and a fingerprint of the configuration and secrets so the journals of a
+    single report, whose arguments often repeat from one run to another,
+    share their resolutions. The table belongs to the caller and lives no
+    longer than it.
+
+    The journal is never altered, resolved values are fresh objects that
+    must be treated as read-only.
+    """
+    context = None
+    if substitutions is not None:
+        context = fingerprint(configuration, secrets)
+
+    # values are kept alongside their resolution so their id is not reused
+    resolved = {}
+
+    def substitution(args: Any, is_tolerance: bool = False) -> Any:
+        key = (id(args), is_tolerance)
+        if key not in resolved:
+            resolved[key] = (args, lookup(args, is_tolerance))
+        return resolved[key][1]
+
+    def lookup(args: Any, is_tolerance: bool) -> Any:
+        content = serialize(args) if context else None
+        if content is None:
+            return resolve(args, is_tolerance, configuration, secrets)
+
+        key = (context, content, is_tolerance)
+        if key not in substitutions:
+            substitutions[key] = resolve(
+                args, is_tolerance, configuration, secrets
+            )
+        # the table is shared by journals which may be rendered concurrently
+        return copy.deepcopy(substitutions[key])
+
+    return substitution
+
+
+def preresolve_activities(journal: Journal, substitution: Substitution):
+    """
+    Resolve, once per journal, the activity values the report template
+    substitutes: arguments and pauses of the runs and tolerances of the
+    steady state probes.
+    """
+    runs = list(journal.get("run") or []) + list(journal.get("rollbacks") or [])
+    for run in runs:
+        activity = run["activity"]
+        provider = activity.get("provider") or {}
+        if "arguments" in provider:
+            substitution(provider["arguments"])
+        pauses = activity.get("pauses") or {}
+        for when in ("before", "after"):
+            if when in pauses:
+                substitution(pauses[when])
+
+    steady_states = journal.get("steady_states") or {}
+    for when in ("before", "after"):
+        for probe in (steady_states.get(when) or {}).get("probes", []):
+            tolerance = probe["activity"].get("tolerance")
+            if tolerance is not None:
+                substitution(tolerance, True)
+
+
+def resolve(
+    args: Any,
+    is_tolerance: bool,
+    configuration: Configuration,
+    secrets: Secrets,
+) -> Any:
+    """
+    Substitute the configuration and secret values into the given value.
+
+    When the value is a probe tolerance, its arguments are substituted
+    without the `value` one that chaostoolkit injects at runtime.
+    """
+    if is_tolerance:
+        if isinstance(args, dict):
+            if args.get("type") == "probe":
+                args = args.get("provider", {}).get("arguments") or {}
+                args = {k: v for k, v in args.items() if k != "value"}
+
+    return substitute_args(args, configuration, secrets)
+
+
+def substitute_args(
+    args: Any, configuration: Configuration, secrets: Secrets
+) -> Any:
+    """
+    Substitute the configuration and secret values into a value or each
+    entry of a mapping of arguments.
+    """
+    if isinstance(args, dict):
+        return {
+            k: substitute(v, configuration, secrets) for k, v in args.items()
+        }
+
+    return substitute(args, configuration, secrets)
+
+
+def fingerprint(
+    configuration: Configuration, secrets: Secrets
+) -> Optional[str]:
+    """
+    Digest of the configuration and secrets, `None` when they cannot be
+    serialized to JSON and values must then be substituted every time.
+    """
+    try:
+        payload = json.dumps(
+            {"configuration": configuration, "secrets": secrets},
+            sort_keys=True,
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def serialize(value: Any) -> Optional[str]:
+    """
+    Serialize a value to JSON to key the substitution table, `None` when it
+    cannot be.
+    """
+    try:
+        return json.dumps(value, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import heapq
+import io
+import json
+import math
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from chaosreport import get_report_template
+
+__all__ = ["generate_summary_headers", "summarize_journals"]
+
+# relative accuracy of the duration percentiles, durations are counted in
+# logarithmic buckets so memory does not grow with the number of journals
+SKETCH_GAMMA = 1.02
+
+
+def summarize_journals(
+    journal_paths: Iterable[str], top: int = 10
+) -> Dict[str, Any]:
+    """
+    Compute aggregate statistics over many journals in a single pass.
+
+    Journals are loaded one at a time and only the aggregates are kept:
+    outcome counts, per experiment duration percentiles, the `top` slowest
+    activities, by their longest run in each experiment, and most frequently
+    failing probes of each experiment and the paths of the `top` journals
+    most worth a detailed look, failed or deviated runs first and then the
+    longest ones.
+    """
+    num_journals = 0
+    num_deviated = 0
+    statuses = Counter()
+    experiments = {}
+    failing_probes = Counter()
+    activities = {}
+    details = []
+
+    for journal_path in journal_paths:
+        with io.open(journal_path) as fp:
+            journal = json.load(fp)
+
+        num_journals += 1
+        title = journal["experiment"]["title"]
+        status = journal.get("status", "unknown")
+        deviated = journal.get("deviated", False)
+        duration = journal.get("duration") or 0
+        failed = status != "completed"
+
+        statuses[status] += 1
+        num_deviated += int(deviated)
+
+        experiment = experiments.setdefault(
+            title, {"runs": 0, "failed": 0, "deviated": 0, "durations": {}}
+        )
+        experiment["runs"] += 1
+        experiment["failed"] += int(failed)
+        experiment["deviated"] += int(deviated)
+        sketch_add(experiment["durations"], duration)
+
+        for run in iter_runs(journal):
+            activity = run["activity"]
+            if activity.get("type") == "probe" and run["status"] != "succeeded":
+                failing_probes[(title, activity["name"])] += 1
+
+            run_duration = run.get("duration") or 0
+            slowest = activities.setdefault(
+                (title, activity["name"]),
+                {"type": activity.get("type"), "runs": 0, "duration": -1},
+            )
+            slowest["runs"] += 1
+            if run_duration > slowest["duration"]:
+                slowest["duration"] = run_duration
+                slowest["journal"] = journal_path
+
+        for key in ("before", "after"):
+            steady_state = (journal.get("steady_states") or {}).get(key) or {}
+            for probe in steady_state.get("probes", []):
+                if probe.get("tolerance_met") is False:
+                    failing_probes[(title, probe["activity"]["name"])] += 1
+
+        push_top(details, (failed or deviated, duration, journal_path), top)
+
+    summary = {
+        "num_journals": num_journals,
+        "num_deviated": num_deviated,
+        "statuses": statuses.most_common(),
+        "experiments": [
+            {
+                "title": title,
+                "runs": e["runs"],
+                "failed": e["failed"],
+                "deviated": e["deviated"],
+                "p50": sketch_percentile(e["durations"], 0.5),
+                "p90": sketch_percentile(e["durations"], 0.9),
+                "p99": sketch_percentile(e["durations"], 0.99),
+                "max": sketch_percentile(e["durations"], 1.0),
+            }
+            for title, e in sorted(experiments.items())
+        ],
+        "slowest_activities": [
+            dict(activity, name=name, experiment=title)
+            for (title, name), activity in heapq.nlargest(
+                top, activities.items(), key=lambda item: item[1]["duration"]
+            )
+        ],
+        "failing_probes": [
+            {"name": name, "experiment": title, "failures": failures}
+            for (title, name), failures in failing_probes.most_common(top)
+        ],
+        "details": [path for _, _, path in sorted(details, reverse=True)],
+    }
+    return summary
+
+
+def generate_summary_headers(
+    summary: Dict[str, Any], export_formats: List[str], title: str = None
+) -> Dict[str, str]:
+    """
+    Render the compact summary, computed by `summarize_journals`, which
+    replaces the report header in summary mode.
+    """
+    template = get_report_template(None, "summary.md")
+
+    summary_info = dict(summary)
+    summary_info["title"] = title or "Chaos Engineering Summary Report"
+    summary_info["today"] = datetime.now().strftime("%d %B %Y")
+
+    return {
+        export_format: template.render(
+            summary_info, export_format=export_format
+        )
+        for export_format in export_formats
+    }
+
+
+def iter_runs(journal: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """
+    Iterate over the method and rollbacks activities a journal ran.
+    """
+    yield from journal.get("run") or []
+    yield from journal.get("rollbacks") or []
+
+
+def push_top(heap: List[Any], entry: Any, size: int):
+    """
+    Keep only the `size` greatest entries pushed onto the heap.
+    """
+    if size <= 0:
+        return
+
+    if len(heap) < size:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+
+
+def sketch_add(sketch: Dict[float, int], value: float):
+    """
+    Count a value in the logarithmic bucket it belongs to.
+    """
+    key = math.ceil(math.log(value, SKETCH_GAMMA)) if value > 0 else -math.inf
+    sketch[key] = sketch.get(key, 0) + 1
+
+
+def sketch_percentile(sketch: Dict[float, int], q: float) -> float:
+    """
+    Estimate the `q` percentile of the values counted in the sketch.
+    """
+    total = sum(sketch.values())
+    if not total:
+        return 0.0
+
+    rank = q * (total - 1)
+    seen = 0
+    for key in sorted(sketch):
+        seen += sketch[key]
+        if seen > rank:
+            break
+
+    if key == -math.inf:
+        return 0.0
+    return 2 * SKETCH_GAMMA**key / (1 + SKETCH_GAMMA)
@@ -0,0 +1,300 @@
+/*
+ * Draws the interactive charts of HTML reports.
+ *
+ * Each `figure.chaosreport-chart` carries its data, as generated by
+ * `chaosreport.chartdata.encode_chart`, in its `data-chart` attribute.
+ * Charts are decoded and drawn onto a canvas only once they are about to be
+ * scrolled into view, so opening a long report stays cheap.
+ */
+(function () {
+    "use strict";
+
+    var COLORS = [
+        "#F44336", "#3F51B5", "#009688", "#FFC107", "#FF5722", "#9C27B0",
+        "#03A9F4", "#8BC34A", "#FF9800", "#E91E63", "#2196F3", "#4CAF50",
+        "#FFEB3B", "#673AB7", "#00BCD4", "#CDDC39", "#9E9E9E", "#607D8B"
+    ];
+    var HEIGHT = 400;
+    var MARGIN = {top: 36, right: 16, bottom: 40, left: 64};
+    var LEGEND_ROW = 18;
+
+    function decode(b64, TypedArray) {
+        var raw = atob(b64);
+        var bytes = new Uint8Array(raw.length);
+        for (var i = 0; i < raw.length; i++) {
+            bytes[i] = raw.charCodeAt(i);
+        }
+        return new TypedArray(bytes.buffer);
+    }
+
+    function load(figure) {
+        var chart = JSON.parse(figure.getAttribute("data-chart"));
+        var deltas = decode(chart.x.deltas, Int32Array);
+        var x = new Float64Array(deltas.length + 1);
+        x[0] = chart.x.start;
+        for (var i = 0; i < deltas.length; i++) {
+            x[i + 1] = x[i] + deltas[i];
+        }
+        chart.x = x;
+        chart.series.forEach(function (serie) {
+            serie.values = decode(serie.values, Float64Array);
+        });
+        return chart;
+    }
+
+    function yRange(chart) {
+        var min = Infinity, max = -Infinity;
+        if (chart.kind === "bar") {
+            // bars are stacked so the range goes up to the largest total
+            for (var i = 0; i < chart.x.length; i++) {
+                var total = 0;
+                chart.series.forEach(function (serie) {
+                    var v = serie.values[i];
+                    if (isFinite(v)) {
+                        total += v;
+                    }
+                });
+                max = Math.max(max, total);
+            }
+            return {min: 0, max: max > 0 ? max : 1};
+        }
+        chart.series.forEach(function (serie) {
+            for (var i = 0; i < serie.values.length; i++) {
+                var v = serie.values[i];
+                if (isFinite(v) && (!chart.logarithmic || v > 0)) {
+                    min = Math.min(min, v);
+                    max = Math.max(max, v);
+                }
+            }
+        });
+        if (min === Infinity) {
+            return {min: chart.logarithmic ? 1 : 0, max: 10};
+        }
+        if (min === max) {
+            max = chart.logarithmic ? max * 10 : max + 1;
+        }
+        return {min: min, max: max};
+    }
+
+    function formatTime(ms) {
+        return new Date(ms).toISOString().substring(11, 19);
+    }
+
+    function formatValue(v) {
+        if (!isFinite(v)) {
+            return "-";
+        }
+        return Math.abs(v) >= 1000 || v === Math.round(v) ?
+            String(Math.round(v)) : v.toPrecision(3);
+    }
+
+    function draw(figure) {
+        var chart = load(figure);
+        var legendRows = Math.ceil(chart.series.length / 4);
+        var width = figure.clientWidth || 800;
+        var height = HEIGHT + legendRows * LEGEND_ROW;
+        var ratio = window.devicePixelRatio || 1;
+
+        var canvas = document.createElement("canvas");
+        canvas.width = width * ratio;
+        canvas.height = height * ratio;
+        canvas.style.width = width + "px";
+        canvas.style.height = height + "px";
+        var caption = document.createElement("figcaption");
+        figure.appendChild(canvas);
+        figure.appendChild(caption);
+
+        var ctx = canvas.getContext("2d");
+        ctx.scale(ratio, ratio);
+        ctx.font = "12px Consolas, 'Liberation Mono', Menlo, monospace";
+
+        var plotWidth = width - MARGIN.left - MARGIN.right;
+        var plotHeight = HEIGHT - MARGIN.top - MARGIN.bottom;
+        var n = chart.x.length;
+        var x0 = chart.x[0], x1 = chart.x[n - 1];
+        var range = yRange(chart);
+        var log = chart.logarithmic;
+        var lo = log ? Math.log10(range.min) : range.min;
+        var hi = log ? Math.log10(range.max) : range.max;
+
+        function px(i) {
+            if (chart.kind === "bar") {
+                return MARGIN.left + (i + 0.5) * plotWidth / n;
+            }
+            var span = x1 - x0 || 1;
+            return MARGIN.left + (chart.x[i] - x0) * plotWidth / span;
+        }
+
+        function py(v) {
+            var y = log ? Math.log10(v) : v;
+            return MARGIN.top + plotHeight - (y - lo) * plotHeight / (hi - lo);
+        }
+
+        // title, axes and guides
+        ctx.fillStyle = "#222";
+        ctx.textAlign = "center";
+        ctx.fillText(chart.title, width / 2, 16);
+        ctx.strokeStyle = "#ddd";
+        ctx.textAlign = "right";
+        for (var t = 0; t <= 5; t++) {
+            var yv = lo + (hi - lo) * t / 5;
+            var yp = MARGIN.top + plotHeight - plotHeight * t / 5;
+            ctx.beginPath();
+            ctx.moveTo(MARGIN.left, yp);
+            ctx.lineTo(MARGIN.left + plotWidth, yp);
+            ctx.stroke();
+            ctx.fillText(formatValue(log ? Math.pow(10, yv) : yv),
+                         MARGIN.left - 6, yp + 4);
+        }
+        ctx.textAlign = "center";
+        for (t = 0; t <= 5 && n > 0; t++) {
+            var idx = Math.round((n - 1) * t / 5);
+            ctx.fillText(formatTime(chart.x[idx]), px(idx),
+                         MARGIN.top + plotHeight + 16);
+        }
+        if (chart.yTitle) {
+            ctx.save();
+            ctx.translate(12, MARGIN.top + plotHeight / 2);
+            ctx.rotate(-Math.PI / 2);
+            ctx.fillText(chart.yTitle, 0, 0);
+            ctx.restore();
+        }
+
+        // data
+        if (chart.kind === "bar") {
+            var barWidth = Math.max(1, plotWidth / n - 1);
+            var base = new Float64Array(n);
+            chart.series.forEach(function (serie, s) {
+                ctx.fillStyle = COLORS[s % COLORS.length];
+                for (var i = 0; i < n; i++) {
+                    var v = serie.values[i];
+                    if (!isFinite(v) || v <= 0) {
+                        continue;
+                    }
+                    var top = py(base[i] + v);
+                    ctx.fillRect(px(i) - barWidth / 2, top, barWidth,
+                                 py(base[i]) - top);
+                    base[i] += v;
+                }
+            });
+        } else {
+            chart.series.forEach(function (serie, s) {
+                ctx.strokeStyle = COLORS[s % COLORS.length];
+                ctx.beginPath();
+                // consecutive points falling onto the same pixel column are
+                // reduced to their extent so drawing cost is bound by width
+                var column = null, min = 0, max = 0, drawing = false;
+                // a point with no neighbour, such as a lone error latency
+                // amongst NaN, makes no line and is drawn as a dot instead
+                var lone = null, dots = [];
+                function flush() {
+                    if (column === null) {
+                        return;
+                    }
+                    if (drawing) {
+                        ctx.lineTo(column, py(min));
+                        lone = null;
+                    } else {
+                        ctx.moveTo(column, py(min));
+                        drawing = true;
+                        lone = max === min ? [column, py(min)] : null;
+                    }
+                    if (max !== min) {
+                        ctx.lineTo(column, py(max));
+                    }
+                    column = null;
+                }
+                function endSegment() {
+                    flush();
+                    if (lone !== null) {
+                        dots.push(lone);
+                        lone = null;
+                    }
+                    drawing = false;
+                }
+                for (var i = 0; i < n; i++) {
+                    var v = serie.values[i];
+                    if (!isFinite(v) || (log && v <= 0)) {
+                        endSegment();
+                        continue;
+                    }
+                    var c = Math.round(px(i));
+                    if (c !== column) {
+                        flush();
+                        column = c;
+                        min = max = v;
+                    } else {
+                        min = Math.min(min, v);
+                        max = Math.max(max, v);
+                    }
+                }
+                endSegment();
+                ctx.stroke();
+                ctx.fillStyle = COLORS[s % COLORS.length];
+                dots.forEach(function (dot) {
+                    ctx.fillRect(dot[0] - 2, dot[1] - 2, 4, 4);
+                });
+            });
+        }
+
+        // legend
+        ctx.textAlign = "left";
+        var legendWidth = plotWidth / 4;
+        chart.series.forEach(function (serie, s) {
+            var lx = MARGIN.left + (s % 4) * legendWidth;
+            var ly = HEIGHT + Math.floor(s / 4) * LEGEND_ROW;
+            ctx.fillStyle = COLORS[s % COLORS.length];
+            ctx.fillRect(lx, ly - 10, 12, 12);
+            ctx.fillStyle = "#222";
+            ctx.fillText(serie.label, lx + 16, ly);
+        });
+
+        // values of the closest abscissa under the pointer
+        canvas.addEventListener("mousemove", function (e) {
+            var offset = e.clientX - canvas.getBoundingClientRect().left;
+            var pos = (offset - MARGIN.left) / plotWidth;
+            if (pos < 0 || pos > 1 || n === 0) {
+                caption.textContent = "";
+                return;
+            }
+            var i = 0;
+            if (chart.kind === "bar") {
+                i = Math.min(n - 1, Math.floor(pos * n));
+            } else {
+                var target = x0 + pos * (x1 - x0);
+                var low = 0, high = n - 1;
+                while (low < high) {
+                    var mid = (low + high) >> 1;
+                    if (chart.x[mid] < target) {
+                        low = mid + 1;
+                    } else {
+                        high = mid;
+                    }
+                }
+                i = low;
+            }
+            caption.textContent = formatTime(chart.x[i]) + " " +
+                chart.series.map(function (serie) {
+                    return serie.label + "=" + formatValue(serie.values[i]);
+                }).join(" ");
+        });
+    }
+
+    var figures = document.querySelectorAll("figure.chaosreport-chart");
+    if (!("IntersectionObserver" in window)) {
+        Array.prototype.forEach.call(figures, draw);
+        return;
+    }
+
+    var observer = new IntersectionObserver(function (entries) {
+        entries.forEach(function (entry) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                draw(entry.target);
+            }
+        });
+    }, {rootMargin: "200px"});
+    Array.prototype.forEach.call(figures, function (figure) {
+        observer.observe(figure);
+    });
+})();
@@ -0,0 +1,51 @@
+from chaosreport import count_activities, index_activities
+
+
+def build_experiment() -> dict:
+    return {
+        "title": "refs",
+        "steady-state-hypothesis": {
+            "title": "up",
+            "probes": [
+                {"type": "probe", "name": "healthy", "tolerance": True},
+                {"ref": "healthy"},
+            ],
+        },
+        "method": [
+            {"type": "action", "name": "stop"},
+            {"ref": "healthy"},
+            {"ref": "stop"},
+            {"ref": "unknown"},
+        ],
+        "rollbacks": [{"ref": "stop"}],
+    }
+
+
+def test_index_activities_resolves_references():
+    experiment = build_experiment()
+    activities = index_activities(experiment)
+
+    hypothesis = experiment["steady-state-hypothesis"]["probes"]
+    stop = experiment["method"][0]
+    assert activities["method"] == [
+        stop,
+        hypothesis[0],
+        stop,
+        {"ref": "unknown"},
+    ]
+    assert activities["rollbacks"] == [stop]
+    assert activities["num_probes"] == 1
+    assert activities["num_actions"] == 2
+
+
+def test_index_activities_leaves_the_experiment_untouched():
+    experiment = build_experiment()
+    index_activities(experiment)
+    assert experiment == build_experiment()
+
+
+def test_count_activities_from_an_index():
+    experiment = build_experiment()
+    activities = index_activities(experiment)
+    assert count_activities(experiment, "action", activities) == 2
+    assert count_activities(experiment, "probe") == 1
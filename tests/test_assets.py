@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pygal
+
+from chaosreport import assets as assets_module
+from chaosreport.assets import embed_assets, register_asset
+
+
+def build_chart() -> str:
+    chart = pygal.Bar()
+    chart.title = "Distribution"
+    chart.add("a", [1, 2, 3])
+    return chart.render(disable_xml_declaration=True)
+
+
+def test_identical_charts_share_a_single_asset():
+    first = build_chart()
+    second = build_chart()
+    # pygal gives each rendering its own random identifier
+    assert first != second
+
+    assets = {}
+    label = register_asset(assets, first)
+    assert register_asset(assets, second) == label
+    assert len(assets) == 1
+    assert 'id="{}"'.format(assets[label]["id"]) in assets[label]["svg"]
+
+
+def test_embed_assets_defines_each_png_once(monkeypatch):
+    rasterized = []
+
+    def svg_to_png(svg: str, optimize: bool = False) -> str:
+        rasterized.append(svg)
+        return "cG5n"
+
+    monkeypatch.setattr(assets_module, "svg_to_png", svg_to_png)
+
+    assets = {}
+    label = register_asset(assets, build_chart())
+    document = "![][{l}]\n\n![][{l}]\n".format(l=label)
+
+    markdown = embed_assets(document, assets, "markdown")
+    assert markdown.count("[{}]: data:image/png;base64,cG5n".format(label)) == 1
+
+    # the PNG is kept in the table for the next format
+    embed_assets(document, assets, "pdf")
+    assert len(rasterized) == 1
+
+
+def test_embed_assets_reuses_inlined_svg_in_html():
+    assets = {}
+    label = register_asset(assets, build_chart())
+    document = "<figure>{l}</figure><figure>{l}</figure>".format(l=label)
+
+    html = embed_assets(document, assets, "html")
+    assert html.count("<svg xmlns") == 1
+    assert html.count('<use href="#{}"/>'.format(assets[label]["id"])) == 1
+    assert label not in html
+
+
+def test_embed_assets_rasterizes_through_the_executor(monkeypatch):
+    monkeypatch.setattr(
+        assets_module, "svg_to_png", lambda svg, optimize=False: svg[-4:]
+    )
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        mapped = []
+
+        def map(self, fn, svgs, *iterables):
+            svgs = list(svgs)
+            self.mapped.append(svgs)
+            return super().map(fn, svgs, *iterables)
+
+    assets = {}
+    labels = [
+        register_asset(assets, "<svg>{}</svg>".format(i)) for i in range(3)
+    ]
+    document = "\n".join("![][{}]".format(label) for label in labels)
+
+    with RecordingExecutor(max_workers=2) as executor:
+        markdown = embed_assets(document, assets, "pdf", executor=executor)
+
+    assert len(RecordingExecutor.mapped) == 1
+    assert len(RecordingExecutor.mapped[0]) == 3
+    for label in labels:
+        definition = "[{}]: data:image/png;base64,{}".format(
+            label, assets[label]["png"]
+        )
+        assert markdown.count(definition) == 1
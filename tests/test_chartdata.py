@@ -0,0 +1,76 @@
+import json
+import math
+from array import array
+from base64 import b64decode
+
+from chaosreport import build_vegeta_charts
+from chaosreport.chartdata import encode_chart
+
+
+def unpack(typecode: str, payload: str) -> list:
+    values = array(typecode)
+    values.frombytes(b64decode(payload))
+    return values.tolist()
+
+
+def test_encode_chart_round_trip():
+    timestamps = [1700000000.0, 1700000000.25, 1700000001.5, 1700000003.0]
+    chart = json.loads(
+        encode_chart(
+            "HTTP Latency",
+            timestamps,
+            [("200", [1.5, None, 3.0, None]), ("500", [None, 12.0, None, 4.5])],
+            y_title="Latency (in ms)",
+            logarithmic=True,
+        )
+    )
+
+    assert chart["title"] == "HTTP Latency"
+    assert chart["kind"] == "line"
+    assert chart["yTitle"] == "Latency (in ms)"
+    assert chart["logarithmic"] is True
+
+    ms = [chart["x"]["start"]]
+    for delta in unpack("i", chart["x"]["deltas"]):
+        ms.append(ms[-1] + delta)
+    assert ms == [int(round(t * 1000)) for t in timestamps]
+
+    series = {s["label"]: unpack("d", s["values"]) for s in chart["series"]}
+    assert list(series) == ["200", "500"]
+    assert series["200"][0] == 1.5 and series["200"][2] == 3.0
+    assert math.isnan(series["200"][1]) and math.isnan(series["200"][3])
+    assert series["500"][1] == 12.0 and series["500"][3] == 4.5
+    assert math.isnan(series["500"][0]) and math.isnan(series["500"][2])
+
+
+def test_encode_chart_without_points():
+    chart = json.loads(encode_chart("Empty", [], []))
+    assert chart["x"] == {"start": 0, "deltas": ""}
+    assert chart["series"] == []
+
+
+def test_vegeta_latency_with_duplicate_timestamps():
+    results = [
+        {"timestamp": "2024-01-01T00:00:01Z", "code": 200, "latency": 3000000},
+        # below the microsecond, both timestamps parse to the same value
+        {
+            "timestamp": "2024-01-01T00:00:00.123456789Z",
+            "code": 500,
+            "latency": 2000000,
+        },
+        {
+            "timestamp": "2024-01-01T00:00:00.123456781Z",
+            "code": 200,
+            "latency": 1000000,
+        },
+    ]
+    calls = "\n".join(json.dumps(result) for result in results)
+
+    _, chart_data = build_vegeta_charts(calls, ["data"])
+    chart = json.loads(chart_data[0])
+
+    assert unpack("i", chart["x"]["deltas"]) == [0, 877]
+    series = {s["label"]: unpack("d", s["values"]) for s in chart["series"]}
+    # calls of the same timestamp keep the order vegeta wrote them in
+    assert series["500"][0] == 2.0 and math.isnan(series["500"][1])
+    assert math.isnan(series["200"][0]) and series["200"][1:] == [1.0, 3.0]
@@ -0,0 +1,58 @@
+import click
+import pytest
+from click.testing import CliRunner
+
+from chaosreport.cli import (
+    report,
+    report_path_for_format,
+    validate_export_formats,
+)
+
+
+def test_export_formats_are_parsed_in_order_without_duplicates():
+    assert validate_export_formats(None, None, "html,pdf,markdown") == [
+        "html",
+        "pdf",
+        "markdown",
+    ]
+    assert validate_export_formats(None, None, " pdf, html ,pdf,") == [
+        "pdf",
+        "html",
+    ]
+
+
+@pytest.mark.parametrize("value", ["", ",", " , "])
+def test_export_formats_cannot_be_empty(value):
+    with pytest.raises(click.BadParameter):
+        validate_export_formats(None, None, value)
+
+
+def test_report_path_is_kept_for_a_single_format():
+    assert report_path_for_format("report.pdf", "html", ["html"]) == (
+        "report.pdf"
+    )
+
+
+def test_report_path_extension_is_swapped_per_format():
+    formats = ["html", "pdf", "markdown"]
+    assert [
+        report_path_for_format("out/report.pdf", f, formats) for f in formats
+    ] == ["out/report.html", "out/report.pdf", "out/report.md"]
+
+
+def test_formats_sharing_a_report_file_are_rejected(tmp_path):
+    journal = tmp_path / "journal.json"
+    journal.write_text("{}")
+
+    result = CliRunner().invoke(
+        report,
+        [
+            "--export-format=html,html5",
+            str(journal),
+            str(tmp_path / "report.html"),
+        ],
+    )
+
+    assert result.exit_code == 2
+    assert "export formats must map to distinct report files" in result.output
+    assert not (tmp_path / "report.html").exists()
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import chaosreport
+from chaosreport import extract_charts, run_vegeta
+
+
+def make_run(index: int, provider: dict) -> dict:
+    return {
+        "activity": {
+            "name": "run-{}".format(index),
+            "type": "probe",
+            **provider,
+        },
+        "status": "succeeded",
+    }
+
+
+def test_extract_charts_keeps_the_order_of_each_run(monkeypatch):
+    prometheus = {
+        "provider": {"type": "python", "module": "chaosprometheus.probes"}
+    }
+    vegeta = {"provider": {"type": "process", "path": "/usr/bin/vegeta"}}
+    journal = {
+        "run": [make_run(i, prometheus) for i in range(4)]
+        + [make_run(4, vegeta), make_run(5, vegeta)]
+    }
+    finished = []
+
+    def prometheus_charts(run, chart_kinds):
+        index = int(run["activity"]["name"].split("-")[1])
+        # the first runs are the last to complete
+        time.sleep(0.05 * (4 - index))
+        run["charts"] = ["{}-first".format(index), "{}-second".format(index)]
+        finished.append(index)
+
+    async def vegeta_charts(run, chart_kinds, executor):
+        index = int(run["activity"]["name"].split("-")[1])
+        await asyncio.sleep(0.05 * (6 - index))
+        run["chart_data"] = ["{}-latency".format(index)]
+        run.setdefault("charts", []).extend(
+            ["{}-latency".format(index), "{}-status".format(index)]
+        )
+        finished.append(index)
+
+    monkeypatch.setattr(
+        chaosreport, "generate_chart_from_prometheus", prometheus_charts
+    )
+    monkeypatch.setattr(
+        chaosreport, "generate_from_vegeta_result_async", vegeta_charts
+    )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        asyncio.run(extract_charts(journal, ["svg"], executor))
+
+    assert finished != sorted(finished)
+    for index, run in enumerate(journal["run"][:4]):
+        assert run["charts"] == [
+            "{}-first".format(index),
+            "{}-second".format(index),
+        ]
+    for index, run in enumerate(journal["run"][4:], start=4):
+        assert run["charts"] == [
+            "{}-latency".format(index),
+            "{}-status".format(index),
+        ]
+        assert run["chart_data"] == ["{}-latency".format(index)]
+
+
+def fake_vegeta(tmp_path, script: str) -> str:
+    path = tmp_path / "vegeta"
+    path.write_text("#!/bin/sh\n{}\n".format(script))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def test_run_vegeta_returns_its_output(tmp_path):
+    vegeta = fake_vegeta(tmp_path, 'echo "$@"')
+    output = asyncio.run(run_vegeta(vegeta, ["report", "r.bin"], "reporter"))
+    assert output == "report r.bin\n"
+
+
+def test_run_vegeta_kills_the_process_on_timeout(tmp_path, monkeypatch):
+    pid_path = tmp_path / "pid"
+    vegeta = fake_vegeta(
+        tmp_path, "echo $$ > {}\nexec sleep 30".format(pid_path)
+    )
+    monkeypatch.setattr(chaosreport, "VEGETA_TIMEOUT", 0.5)
+
+    started = time.monotonic()
+    assert asyncio.run(run_vegeta(vegeta, [], "reporter")) is None
+    assert time.monotonic() - started < 10
+
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_path.read_text()), 0)
+
+
+def test_run_vegeta_returns_none_on_failure(tmp_path):
+    vegeta = fake_vegeta(tmp_path, "echo boom >&2\nexit 3")
+    assert asyncio.run(run_vegeta(vegeta, [], "dumper")) is None
@@ -0,0 +1,112 @@
+import json
+
+import chaosreport
+from chaosreport import (
+    assets as assets_module,
+    generate_report,
+    generate_report_header,
+    generate_reports,
+)
+
+
+def build_journal() -> dict:
+    timestamps = [1700000000 + 15 * i for i in range(10)]
+    probe = {
+        "type": "probe",
+        "name": "up",
+        "provider": {
+            "type": "python",
+            "module": "chaosprometheus.probes",
+            "func": "query_interval",
+            "arguments": {"query": "up"},
+        },
+    }
+    return {
+        "chaoslib-version": "1.44.0",
+        "platform": "Linux",
+        "node": "host",
+        "start": "2024-01-01T10:00:00",
+        "end": "2024-01-01T10:05:00",
+        "duration": 300,
+        "status": "completed",
+        "deviated": False,
+        "experiment": {
+            "title": "Multi format",
+            "description": "A single report pass",
+            "tags": ["kubernetes"],
+            "contributions": {"availability": "high"},
+            "method": [probe],
+        },
+        "steady_states": {"before": None, "after": None, "during": []},
+        "run": [
+            {
+                "activity": probe,
+                "status": "succeeded",
+                "start": "2024-01-01T10:01:00",
+                "end": "2024-01-01T10:01:01",
+                "duration": 1,
+                "output": {
+                    "status": "success",
+                    "data": {
+                        "resultType": "matrix",
+                        "result": [
+                            {
+                                "metric": {"__name__": "up", "pod": "p1"},
+                                "values": [[t, "1"] for t in timestamps],
+                            }
+                        ],
+                    },
+                },
+            }
+        ],
+        "rollbacks": [],
+    }
+
+
+def count_calls(monkeypatch, module, name: str, result=None) -> list:
+    calls = []
+    original = getattr(module, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return result if result is not None else original(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, wrapper)
+    return calls
+
+
+def test_charts_are_built_and_rasterized_once_for_all_formats(monkeypatch):
+    built = count_calls(monkeypatch, chaosreport, "render_chart")
+    minified = count_calls(monkeypatch, assets_module, "minify_svg")
+    rasterized = count_calls(monkeypatch, assets_module, "svg_to_png", "cG5n")
+
+    reports = generate_reports(build_journal(), ["html", "pdf", "markdown"])
+
+    assert list(reports) == ["html", "pdf", "markdown"]
+    # the Prometheus chart and the contributions one
+    assert len(built) == 2
+    assert len(minified) == 2
+    assert len(rasterized) == 2
+
+    assert reports["html"].count("<svg xmlns") == 2
+    assert "data:image/png" not in reports["html"]
+    for export_format in ("pdf", "markdown"):
+        assert reports[export_format].count("data:image/png;base64,cG5n") == 2
+        assert "<svg" not in reports[export_format]
+
+
+def test_single_format_wrappers_embed_their_charts(monkeypatch, tmp_path):
+    count_calls(monkeypatch, assets_module, "svg_to_png", "cG5n")
+
+    html = generate_report(build_journal(), "html")
+    assert html.count("<svg xmlns") == 2
+    assert "chaosreport-asset-" not in html
+
+    markdown = generate_report(build_journal(), "markdown")
+    assert markdown.count("data:image/png;base64,cG5n") == 2
+
+    journal_path = tmp_path / "journal.json"
+    journal_path.write_text(json.dumps(build_journal()))
+    header = generate_report_header([str(journal_path)], "pdf")
+    assert header.count("data:image/png;base64,cG5n") == 4
+    assert "<svg" not in header
@@ -0,0 +1,81 @@
+import copy
+
+from chaosreport.substitution import make_substitution, preresolve_activities
+
+
+def build_journal() -> dict:
+    return {
+        "run": [
+            {
+                "activity": {
+                    "type": "action",
+                    "name": "scale",
+                    "provider": {"arguments": {"replicas": "${replicas}"}},
+                }
+            }
+        ],
+        "steady_states": {
+            "before": {
+                "probes": [
+                    {
+                        "activity": {
+                            "type": "probe",
+                            "name": "healthy",
+                            "tolerance": {
+                                "type": "probe",
+                                "provider": {
+                                    "arguments": {
+                                        "target": "${url}",
+                                        "value": 200,
+                                    }
+                                },
+                            },
+                        }
+                    }
+                ]
+            }
+        },
+    }
+
+
+def test_tolerance_substitution_leaves_the_journal_untouched():
+    journal = build_journal()
+    original = copy.deepcopy(journal)
+    substitution = make_substitution({"url": "http://app"}, {})
+
+    preresolve_activities(journal, substitution)
+    probe = journal["steady_states"]["before"]["probes"][0]["activity"]
+    resolved = substitution(probe["tolerance"], True)
+
+    assert resolved == {"target": "http://app"}
+    assert journal == original
+
+
+def test_substitutions_are_shared_through_the_caller_table():
+    substitutions = {}
+    first = make_substitution({"replicas": 3}, {}, substitutions)
+    second = make_substitution({"replicas": 3}, {}, substitutions)
+    other = make_substitution({"replicas": 5}, {}, substitutions)
+
+    first_args = build_journal()["run"][0]["activity"]["provider"]
+    second_args = build_journal()["run"][0]["activity"]["provider"]
+
+    resolved = first(first_args["arguments"])
+    assert resolved == {"replicas": 3}
+    assert len(substitutions) == 1
+
+    shared = second(second_args["arguments"])
+    assert shared == resolved
+    # journals never share the objects they are given
+    assert shared is not resolved
+    assert len(substitutions) == 1
+
+    assert other(first_args["arguments"]) == {"replicas": 5}
+    assert len(substitutions) == 2
+
+
+def test_substitutions_are_not_kept_without_a_table():
+    substitution = make_substitution({"replicas": 3}, {})
+    args = {"replicas": "${replicas}"}
+    assert substitution(args) == {"replicas": 3}
+    assert substitution(args) is substitution(args)
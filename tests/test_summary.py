@@ -0,0 +1,98 @@
+import json
+import random
+
+from chaosreport.summary import (
+    sketch_add,
+    sketch_percentile,
+    summarize_journals,
+)
+
+
+def test_sketch_percentile_is_within_two_percent():
+    rng = random.Random(42)
+    values = sorted(rng.lognormvariate(3, 1.5) for _ in range(10000))
+
+    sketch = {}
+    for value in values:
+        sketch_add(sketch, value)
+
+    for q in (0.5, 0.9, 0.99, 1.0):
+        expected = values[int(q * (len(values) - 1))]
+        assert abs(sketch_percentile(sketch, q) - expected) <= 0.02 * expected
+
+
+def test_sketch_percentile_of_zero_durations():
+    sketch = {}
+    assert sketch_percentile(sketch, 0.5) == 0.0
+    sketch_add(sketch, 0)
+    assert sketch_percentile(sketch, 0.5) == 0.0
+
+
+def write_journal(tmp_path, name: str, durations: list) -> str:
+    journal = {
+        "experiment": {"title": "exp"},
+        "status": "completed",
+        "duration": sum(durations),
+        "run": [
+            # activities without a type must not break the ranking
+            {
+                "activity": {"name": "call", "type": None},
+                "status": "succeeded",
+                "duration": duration,
+            }
+            for duration in durations
+        ],
+    }
+    path = tmp_path / name
+    path.write_text(json.dumps(journal))
+    return str(path)
+
+
+def test_slowest_activities_are_aggregated_per_experiment(tmp_path):
+    paths = [
+        write_journal(tmp_path, "a.json", [1.0, 1.0]),
+        write_journal(tmp_path, "b.json", [3.0, 1.0]),
+        write_journal(tmp_path, "c.json", [2.0]),
+    ]
+
+    summary = summarize_journals(paths, top=5)
+
+    assert summary["slowest_activities"] == [
+        {
+            "name": "call",
+            "type": None,
+            "experiment": "exp",
+            "runs": 5,
+            "duration": 3.0,
+            "journal": paths[1],
+        }
+    ]
+
+
+def test_failing_probes_are_counted_per_experiment(tmp_path):
+    paths = []
+    for index, (title, failures) in enumerate([("a", 2), ("b", 1)]):
+        probe = {"activity": {"name": "health-check"}, "tolerance_met": False}
+        journal = {
+            "experiment": {"title": title},
+            "status": "completed",
+            "duration": 1,
+            "run": [
+                {
+                    "activity": {"name": "health-check", "type": "probe"},
+                    "status": "failed",
+                    "duration": 1,
+                }
+            ],
+            "steady_states": {"before": {"probes": [probe] * (failures - 1)}},
+        }
+        path = tmp_path / "{}.json".format(index)
+        path.write_text(json.dumps(journal))
+        paths.append(str(path))
+
+    summary = summarize_journals(paths)
+
+    assert summary["failing_probes"] == [
+        {"name": "health-check", "experiment": "a", "failures": 2},
+        {"name": "health-check", "experiment": "b", "failures": 1},
+    ]